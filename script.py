@@ -6,15 +6,52 @@ Verifica se arquivos estão corrompidos ou íntegros através de diferentes mét
 
 import os
 import sys
+import re
+import codecs
 import hashlib
 import json
 import csv
-from pathlib import Path
+import importlib.util
+import mmap
+import sqlite3
+import struct
+from collections import deque
+from itertools import chain, islice
 from datetime import datetime
-from typing import Dict, List, Tuple, Optional
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple, Optional
 import argparse
 import logging
 import subprocess
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from dataclasses import dataclass, fields
+from operator import attrgetter
+
+try:
+    import charset_normalizer  # Opcional: detecção de encodings não UTF-8
+except ImportError:
+    charset_normalizer = None
+
+try:
+    import orjson  # Opcional: serialização JSON mais rápida
+except ImportError:
+    orjson = None
+
+try:
+    import blake3  # Opcional: hash BLAKE3 (--hash blake3)
+except ImportError:
+    blake3 = None
+
+try:
+    import xxhash  # Opcional: hash XXH3 não criptográfico (--hash xxh3)
+except ImportError:
+    xxhash = None
+
+try:
+    import numpy as np  # Opcional: contagem de bytes compilada com numba
+    from numba import njit
+except ImportError:
+    njit = None
 
 # Configurar logging
 logging.basicConfig(
@@ -25,6 +62,290 @@ logging.basicConfig(
         logging.StreamHandler()
     ]
 )
+logger = logging.getLogger(__name__)
+
+# Número padrão de threads para a verificação (trabalho dominado por I/O)
+DEFAULT_MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Tamanho do bloco lido por iteração no cálculo de hashes. Blocos grandes
+# reduzem o custo de syscalls e do loop Python; como é bem maior que o buffer
+# padrão de 8 KiB, os arquivos são abertos sem buffer (buffering=0)
+HASH_CHUNK_SIZE = 1 << 20
+
+# Dicas de acesso ao page cache (apenas em sistemas com posix_fadvise)
+FADV_SEQUENTIAL = getattr(os, 'POSIX_FADV_SEQUENTIAL', None)
+FADV_DONTNEED = getattr(os, 'POSIX_FADV_DONTNEED', None)
+
+# Só arquivos acima deste tamanho têm as páginas liberadas após o hash;
+# abaixo disso a syscall extra custa mais do que as poucas páginas ocupadas
+DROP_CACHE_THRESHOLD = 8 << 20
+
+# Arquivos a partir deste tamanho são hasheados via mmap, direto das páginas
+# do cache, sem cópia para um buffer do processo
+MMAP_HASH_THRESHOLD = 100 << 20
+MADV_SEQUENTIAL = getattr(mmap, 'MADV_SEQUENTIAL', None)
+
+# Extensões tratadas como Excel (contagem e oferta de dependências)
+EXCEL_EXTENSIONS = ('.xlsx', '.xls')
+
+# Arquivos abaixo deste tamanho são agrupados em lotes por tarefa do pool
+SMALL_FILE_THRESHOLD = 1 << 20
+SMALL_FILE_BATCH_SIZE = 16
+
+# Máximo de lotes enviados ao pool e ainda não consolidados; limita a
+# memória quando a varredura descobre arquivos mais rápido do que verifica
+MAX_PENDING_BATCHES = 512
+
+# Stats das entradas descobertas são feitos em blocos por um pool próprio,
+# para que a latência de metadados (disco frio, rede) não serialize o percurso
+STAT_BATCH_SIZE = 256
+STAT_WORKERS = 8
+
+# Modo rápido: arquivos acima do limite recebem apenas uma impressão digital
+# (tamanho + SHA256 do primeiro e do último bloco) em vez do hash completo
+FAST_MODE_THRESHOLD = 100 << 20
+FINGERPRINT_BLOCK_SIZE = 1 << 20
+
+# Separadores candidatos para CSV, em ordem de preferência em caso de empate
+CSV_SEPARATORS = (',', ';', '\t', '|')
+
+# Quantidade de bytes lida do início do arquivo para detectar o encoding
+ENCODING_SAMPLE_SIZE = 64 * 1024
+
+# Bytes de controle em arquivos texto (exceto tab, LF, FF e CR) e a fração a
+# partir da qual o conteúdo é sinalizado como possivelmente binário
+TEXT_CONTROL_BYTES = bytes(b for b in range(32) if b not in (9, 10, 12, 13)) + b'\x7f'
+CONTROL_CHARS_WARNING_RATIO = 0.1
+
+# Statements SQL contados em arquivos .sql (palavras inteiras)
+SQL_STATEMENT_RE = re.compile(r'\b(?:SELECT|INSERT|UPDATE|DELETE|CREATE|DROP)\b', re.IGNORECASE)
+
+# Intervalo (em arquivos) entre as mensagens de progresso no log
+PROGRESS_LOG_INTERVAL = 1000
+
+# Arquivo padrão do cache de resultados entre execuções
+DEFAULT_CACHE_FILE = '.integrity_cache.db'
+# Versão do esquema do cache; bancos de versões anteriores são recriados
+CACHE_SCHEMA_VERSION = 2
+
+# Algoritmos aceitos para o hash principal; blake3 e xxh3 dependem de
+# pacotes opcionais e caem para SHA256 quando não instalados
+HASH_ALGORITHMS = ('sha256', 'blake3', 'xxh3')
+DEFAULT_HASH_ALGORITHM = 'sha256'
+
+if njit is not None:
+    @njit(cache=True)
+    def _count_control_bytes_jit(data):
+        count = 0
+        for i in range(data.size):
+            b = data[i]
+            if (b < 32 and b != 9 and b != 10 and b != 12 and b != 13) or b == 127:
+                count += 1
+        return count
+
+def count_control_bytes(data: bytes) -> int:
+    """Contar bytes de controle em um bloco (numba se disponível)"""
+    if njit is not None:
+        return int(_count_control_bytes_jit(np.frombuffer(data, dtype=np.uint8)))
+    return len(data) - len(data.translate(None, TEXT_CONTROL_BYTES))
+
+# slots=True (Python 3.10+) reduz a memória por resultado
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**_DATACLASS_SLOTS)
+class FileResult:
+    """Resultado da verificação de integridade de um arquivo"""
+    file_path: str
+    file_name: str
+    file_size: int = 0
+    is_accessible: bool = False
+    is_readable: bool = False
+    permissions: str = ''
+    last_modified: str = ''
+    error: Optional[str] = None
+    md5_hash: Optional[str] = None
+    sha256_hash: Optional[str] = None
+    blake3_hash: Optional[str] = None
+    xxh3_hash: Optional[str] = None
+    sha256_fingerprint: Optional[str] = None
+    specific_checks: Optional[Dict] = None
+    integrity_status: str = ''
+    warning: Optional[str] = None
+    
+    def to_dict(self) -> Dict:
+        """Converter para dicionário, omitindo campos opcionais não preenchidos"""
+        return {
+            name: value for name, value in zip(FILE_RESULT_FIELDS, _file_result_values(self))
+            if value is not None or name not in FILE_RESULT_OPTIONAL_FIELDS
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'FileResult':
+        """Criar a partir de um dicionário (ignora chaves desconhecidas)"""
+        return cls(**{name: data[name] for name in FILE_RESULT_FIELDS if name in data})
+
+FILE_RESULT_FIELDS = tuple(field.name for field in fields(FileResult))
+FILE_RESULT_OPTIONAL_FIELDS = frozenset(('md5_hash', 'sha256_hash', 'blake3_hash', 'xxh3_hash',
+                                         'sha256_fingerprint', 'specific_checks', 'warning'))
+_file_result_values = attrgetter(*FILE_RESULT_FIELDS)
+
+# Colunas fixas do relatório CSV (seguidas das colunas specific_*)
+CSV_REPORT_FIELDS = ('file_path', 'file_name', 'file_size', 'integrity_status', 'is_accessible',
+                     'is_readable', 'last_modified', 'md5_hash', 'sha256_hash', 'blake3_hash',
+                     'xxh3_hash', 'sha256_fingerprint', 'error')
+
+@dataclass(**_DATACLASS_SLOTS)
+class SummaryPercentages:
+    """Percentuais do sumário, compartilhados pelos relatórios e pelo console"""
+    intact: float
+    corrupted: float
+    inaccessible: float
+
+def compute_summary_percentages(summary: Dict) -> Optional[SummaryPercentages]:
+    """Calcular os percentuais por status (None se nenhum arquivo foi verificado)"""
+    total = summary['total_files']
+    if total == 0:
+        return None
+    return SummaryPercentages(
+        intact=(summary['intact_files'] / total) * 100,
+        corrupted=(summary['corrupted_files'] / total) * 100,
+        inaccessible=(summary['inaccessible_files'] / total) * 100,
+    )
+
+def get_file_extension(file_path: str) -> str:
+    """Extensão em minúsculas (equivalente a Path(file_path).suffix.lower())"""
+    # Evita criar um objeto Path por arquivo no caminho crítico da verificação
+    dot = file_path.rfind('.')
+    sep = max(file_path.rfind(os.sep), file_path.rfind(os.altsep) if os.altsep else -1)
+    return file_path[dot:].lower() if sep + 1 < dot < len(file_path) - 1 else ''
+
+def advise_file_access(fd: int, advice: Optional[int]) -> None:
+    """Informar ao kernel o padrão de acesso do arquivo (sem efeito fora de POSIX)"""
+    if advice is None:
+        return
+    try:
+        os.posix_fadvise(fd, 0, 0, advice)
+    except OSError:
+        pass
+
+def hash_algorithm_available(algorithm: str) -> bool:
+    """Verificar se o algoritmo de hash pode ser usado neste ambiente"""
+    if algorithm == 'blake3':
+        return blake3 is not None
+    if algorithm == 'xxh3':
+        return xxhash is not None
+    return algorithm in hashlib.algorithms_available
+
+def module_available(name: str) -> bool:
+    """Verificar se um módulo opcional pode ser importado, sem importá-lo"""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+def new_hash(algorithm: str):
+    """Criar objeto de hash (hashlib, ou pacotes opcionais para blake3/xxh3)"""
+    if algorithm == 'blake3':
+        return blake3.blake3()
+    if algorithm == 'xxh3':
+        return xxhash.xxh3_128()
+    return hashlib.new(algorithm)
+
+def update_hashes_from_file(f, hash_funcs: List) -> None:
+    """Alimentar os hashes com o conteúdo do arquivo, reutilizando um único buffer"""
+    # Arquivos menores que um bloco terminam aqui, sem alocar o buffer
+    chunk = f.read(HASH_CHUNK_SIZE)
+    while 0 < len(chunk) < HASH_CHUNK_SIZE:
+        for hash_func in hash_funcs:
+            hash_func.update(chunk)
+        chunk = f.read(HASH_CHUNK_SIZE)
+    if not chunk:
+        return
+    for hash_func in hash_funcs:
+        hash_func.update(chunk)
+    
+    buffer = bytearray(HASH_CHUNK_SIZE)
+    view = memoryview(buffer)
+    while True:
+        size = f.readinto(buffer)
+        if not size:
+            break
+        chunk = view[:size]
+        for hash_func in hash_funcs:
+            hash_func.update(chunk)
+
+def _mmap_hash_slots() -> int:
+    """Mapeamentos simultâneos para hash: cerca de 1/4 da RAM em arquivos do limiar"""
+    try:
+        physical_memory = os.sysconf('SC_PHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
+    except (AttributeError, ValueError, OSError):
+        return 4
+    return max(1, physical_memory // 4 // MMAP_HASH_THRESHOLD)
+
+# Limita quantas threads mapeiam arquivos grandes ao mesmo tempo
+_MMAP_HASH_SEMAPHORE = threading.BoundedSemaphore(_mmap_hash_slots())
+
+def update_hashes_from_mmap(f, hash_funcs: List) -> bool:
+    """Alimentar os hashes mapeando o arquivo; False se o mmap não está disponível"""
+    if not _MMAP_HASH_SEMAPHORE.acquire(blocking=False):
+        return False
+    
+    try:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return False
+        
+        with mm:
+            if MADV_SEQUENTIAL is not None:
+                mm.madvise(MADV_SEQUENTIAL)
+            # Blocos percorrem o mapeamento uma única vez mesmo com vários hashes
+            with memoryview(mm) as view:
+                for offset in range(0, len(mm), HASH_CHUNK_SIZE):
+                    chunk = view[offset:offset + HASH_CHUNK_SIZE]
+                    for hash_func in hash_funcs:
+                        hash_func.update(chunk)
+                    chunk.release()
+        return True
+    finally:
+        _MMAP_HASH_SEMAPHORE.release()
+
+def update_hashes(f, hash_funcs: List, size: Optional[int] = None) -> None:
+    """Alimentar os hashes com o arquivo inteiro (mmap para arquivos grandes)
+    
+    O tamanho vem normalmente do stat já feito na varredura; só decide a
+    estratégia de leitura, e o conteúdo é lido até o fim de qualquer forma.
+    """
+    if size is None:
+        size = os.fstat(f.fileno()).st_size
+    # Arquivos de um único bloco não se beneficiam de readahead maior
+    if size > HASH_CHUNK_SIZE:
+        advise_file_access(f.fileno(), FADV_SEQUENTIAL)
+    if size < MMAP_HASH_THRESHOLD or not update_hashes_from_mmap(f, hash_funcs):
+        update_hashes_from_file(f, hash_funcs)
+
+def stat_entry(entry: os.DirEntry) -> Optional[os.stat_result]:
+    """Stat de uma entrada de diretório, ou None se não puder ser obtido"""
+    try:
+        return entry.stat()
+    except OSError:
+        return None
+
+class PathEntry:
+    """Caminho avulso com a parte da interface de os.DirEntry usada na varredura"""
+    __slots__ = ('path',)
+    
+    def __init__(self, path: str):
+        self.path = path
+    
+    def stat(self) -> os.stat_result:
+        return os.stat(self.path)
+
+def json_dumps_bytes(obj) -> bytes:
+    """Serializar objeto em JSON compacto (UTF-8), usando orjson se disponível"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, default=str).encode('utf-8')
 
 class ExcelDependencyManager:
     """Gerenciador de dependências para arquivos Excel"""
@@ -90,15 +411,137 @@ class ExcelDependencyManager:
         except Exception as e:
             return False, f"Erro inesperado: {e}"
 
+class IntegrityCache:
+    """Cache persistente (SQLite) de resultados por caminho, mtime, ctime e tamanho
+    
+    Cada resultado guarda também o perfil de verificação (opções e módulos que
+    influenciam as verificações específicas); perfis diferentes não reaproveitam
+    o resultado.
+    
+    Falhas do SQLite depois da abertura não interrompem a verificação: leitura
+    com erro conta como ausência no cache e gravação com erro é descartada.
+    """
+    
+    def __init__(self, db_path: str, batch_size: int = 500):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self._pending = []
+        # A conexão é compartilhada entre as threads de verificação
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        try:
+            self._init_schema()
+        except sqlite3.Error:
+            self._conn.close()
+            raise
+    
+    def _init_schema(self) -> None:
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        # Resultados gravados com outro esquema não são comparáveis: recriar
+        if self._conn.execute('PRAGMA user_version').fetchone()[0] != CACHE_SCHEMA_VERSION:
+            self._conn.execute('DROP TABLE IF EXISTS file_results')
+            self._conn.execute(f'PRAGMA user_version = {CACHE_SCHEMA_VERSION}')
+        # ctime muda com chmod/chown, que não alteram o mtime
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS file_results ('
+            'path TEXT PRIMARY KEY, mtime_ns INTEGER, ctime_ns INTEGER, size INTEGER, '
+            'profile TEXT, sha256 TEXT, result_json TEXT)'
+        )
+        self._conn.commit()
+    
+    def get(self, path: str, mtime_ns: int, ctime_ns: int, size: int, profile: str) -> Optional[Dict]:
+        """Obter resultado em cache se o arquivo e o perfil de verificação não mudaram"""
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    'SELECT result_json FROM file_results '
+                    'WHERE path = ? AND mtime_ns = ? AND ctime_ns = ? AND size = ? AND profile = ?',
+                    (path, mtime_ns, ctime_ns, size, profile)
+                ).fetchone()
+            return json.loads(row[0]) if row else None
+        except (sqlite3.Error, ValueError) as e:
+            logger.debug("Erro ao ler o cache para %s: %s", path, e)
+            return None
+    
+    def put(self, path: str, mtime_ns: int, ctime_ns: int, size: int, profile: str,
+            result: Dict) -> None:
+        """Armazenar resultado; gravações são feitas em lotes"""
+        row = (path, mtime_ns, ctime_ns, size, profile, result.get('sha256_hash'),
+               json.dumps(result, ensure_ascii=False, default=str))
+        with self._lock:
+            self._pending.append(row)
+            if len(self._pending) >= self.batch_size:
+                self._flush_pending()
+    
+    def flush(self) -> None:
+        """Gravar resultados pendentes"""
+        with self._lock:
+            self._flush_pending()
+    
+    def _flush_pending(self) -> None:
+        if not self._pending:
+            return
+        try:
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO file_results VALUES (?, ?, ?, ?, ?, ?, ?)', self._pending
+            )
+            self._conn.commit()
+        except sqlite3.Error as e:
+            # Os resultados só deixam de ser reaproveitados na próxima execução
+            logger.warning(f"Erro ao gravar o cache ({len(self._pending)} resultados descartados): {e}")
+            try:
+                self._conn.rollback()
+            except sqlite3.Error:
+                pass
+        finally:
+            self._pending = []
+
 class FileIntegrityChecker:
     """Classe para verificar integridade de arquivos"""
     
-    def __init__(self, directories: List[str], output_format: str = 'json', auto_install_excel=False):
+    # Contador do sumário correspondente a cada status (UNKNOWN só entra no total)
+    _STATUS_KEYS = {
+        'INTACT': 'intact_files',
+        'CORRUPTED': 'corrupted_files',
+        'INACCESSIBLE': 'inaccessible_files',
+    }
+    
+    def __init__(self, directories: List[str], output_format: str = 'json', auto_install_excel=False,
+                 max_workers: Optional[int] = None, legacy_md5: bool = False,
+                 cache_path: Optional[str] = None, fast_mode: bool = False,
+                 excel_full_analysis: bool = False, deep_verification: bool = False,
+                 hash_algorithm: str = DEFAULT_HASH_ALGORITHM):
         self.directories = directories
         self.output_format = output_format
         self.auto_install_excel = auto_install_excel
+        self.max_workers = max_workers or DEFAULT_MAX_WORKERS
+        self.legacy_md5 = legacy_md5
+        self.fast_mode = fast_mode
+        self.excel_full_analysis = excel_full_analysis
+        self.deep_verification = deep_verification
+        # Cada algoritmo aceito tem seu campo <algoritmo>_hash em FileResult
+        if hash_algorithm not in HASH_ALGORITHMS:
+            raise ValueError(f"Algoritmo de hash desconhecido: '{hash_algorithm}' "
+                             f"(opções: {', '.join(HASH_ALGORITHMS)})")
+        if not hash_algorithm_available(hash_algorithm):
+            logger.warning(f"Algoritmo de hash '{hash_algorithm}' indisponível (pacote não instalado); "
+                           f"usando {DEFAULT_HASH_ALGORITHM}")
+            hash_algorithm = DEFAULT_HASH_ALGORITHM
+        self.hash_algorithm = hash_algorithm
+        self._hash_field = f'{hash_algorithm}_hash'
+        self.cache = None
+        if cache_path:
+            try:
+                self.cache = IntegrityCache(cache_path)
+            except sqlite3.Error as e:
+                logger.warning(f"Cache indisponível ({cache_path}): {e}; verificação seguirá sem cache")
         self.results = []
         self.excel_enhancement_checked = False
+        # Módulos Excel disponíveis, no formato do perfil do cache (após a instalação)
+        self._excel_modules_profile = None
+        # Protege o estado compartilhado alterado pelas threads de verificação
+        self._lock = threading.Lock()
         self.summary = {
             'total_files': 0,
             'intact_files': 0,
@@ -124,81 +567,132 @@ class FileIntegrityChecker:
             '.rar': self._check_rar_file
         }
     
-    def calculate_file_hash(self, file_path: str, algorithm: str = 'md5') -> Optional[str]:
+    def calculate_file_hash(self, file_path: str, algorithm: str = 'md5',
+                            file_size: Optional[int] = None) -> Optional[str]:
         """Calcula hash do arquivo para verificação de integridade"""
         try:
-            hash_func = hashlib.new(algorithm)
-            with open(file_path, 'rb') as f:
-                for chunk in iter(lambda: f.read(4096), b""):
-                    hash_func.update(chunk)
+            hash_func = new_hash(algorithm)
+            with open(file_path, 'rb', buffering=0) as f:
+                update_hashes(f, [hash_func], file_size)
+            return hash_func.hexdigest()
+        except Exception as e:
+            logger.error(f"Erro ao calcular hash do arquivo {file_path}: {e}")
+            return None
+    
+    def calculate_file_hashes(self, file_path: str, algorithms: Tuple[str, ...] = ('md5', 'sha256'),
+                              drop_cache: bool = False,
+                              file_size: Optional[int] = None) -> Dict[str, Optional[str]]:
+        """Calcula vários hashes do arquivo em uma única leitura"""
+        try:
+            hash_funcs = [new_hash(algorithm) for algorithm in algorithms]
+            with open(file_path, 'rb', buffering=0) as f:
+                update_hashes(f, hash_funcs, file_size)
+                # Páginas lidas uma única vez não devem expulsar outras do cache
+                if drop_cache:
+                    advise_file_access(f.fileno(), FADV_DONTNEED)
+            return {algorithm: hash_func.hexdigest() for algorithm, hash_func in zip(algorithms, hash_funcs)}
+        except Exception as e:
+            logger.error(f"Erro ao calcular hash do arquivo {file_path}: {e}")
+            return {algorithm: None for algorithm in algorithms}
+    
+    def calculate_file_fingerprint(self, file_path: str, file_size: int) -> Optional[str]:
+        """Calcula impressão digital do arquivo a partir do tamanho, início e fim"""
+        try:
+            hash_func = hashlib.sha256(str(file_size).encode('ascii'))
+            with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                hash_func.update(mm[:FINGERPRINT_BLOCK_SIZE])
+                hash_func.update(mm[-FINGERPRINT_BLOCK_SIZE:])
             return hash_func.hexdigest()
         except Exception as e:
-            logging.error(f"Erro ao calcular hash do arquivo {file_path}: {e}")
+            logger.error(f"Erro ao calcular impressão digital do arquivo {file_path}: {e}")
             return None
     
-    def _check_basic_accessibility(self, file_path: str) -> Dict:
+    def _check_basic_accessibility(self, file_path: str, stat_info: Optional[os.stat_result] = None) -> FileResult:
         """Verificação básica de acessibilidade do arquivo"""
-        result = {
-            'file_path': file_path,
-            'file_name': os.path.basename(file_path),
-            'file_size': 0,
-            'is_accessible': False,
-            'is_readable': False,
-            'permissions': '',
-            'last_modified': '',
-            'error': None
-        }
+        result = FileResult(file_path=file_path, file_name=os.path.basename(file_path))
         
         try:
-            # Verificar se arquivo existe
-            if not os.path.exists(file_path):
-                result['error'] = 'Arquivo não encontrado'
-                return result
+            # Obter informações do arquivo (um único stat, reaproveitado da
+            # listagem do diretório quando disponível)
+            if stat_info is None:
+                stat_info = os.stat(file_path)
             
-            # Obter informações do arquivo
-            stat_info = os.stat(file_path)
-            result['file_size'] = stat_info.st_size
-            result['last_modified'] = datetime.fromtimestamp(stat_info.st_mtime).isoformat()
-            result['permissions'] = oct(stat_info.st_mode)[-3:]
-            result['is_accessible'] = True
+            result.file_size = stat_info.st_size
+            result.last_modified = datetime.fromtimestamp(stat_info.st_mtime).isoformat()
+            result.permissions = oct(stat_info.st_mode)[-3:]
+            result.is_accessible = True
             
-            # Verificar se é legível
-            if os.access(file_path, os.R_OK):
-                result['is_readable'] = True
+            # A legibilidade é decidida pela abertura do arquivo para o hash:
+            # o bit do dono não vale para outros usuários nem para root, e uma
+            # falha no hash marca o arquivo como ilegível
+            result.is_readable = True
             
+        except FileNotFoundError:
+            result.error = 'Arquivo não encontrado'
         except Exception as e:
-            result['error'] = str(e)
-            logging.error(f"Erro ao acessar arquivo {file_path}: {e}")
+            result.error = str(e)
+            logger.error(f"Erro ao acessar arquivo {file_path}: {e}")
         
         return result
     
+    def _detect_encoding(self, file_path: str) -> str:
+        """Detectar encoding do arquivo a partir do BOM ou de uma amostra inicial"""
+        with open(file_path, 'rb') as f:
+            raw = f.read(ENCODING_SAMPLE_SIZE)
+        
+        if raw.startswith(codecs.BOM_UTF8):
+            return 'utf-8-sig'
+        if raw.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+            return 'utf-16'
+        
+        # UTF-8 válido é um indicador forte; final=False tolera um caractere
+        # multibyte cortado no fim da amostra
+        try:
+            codecs.getincrementaldecoder('utf-8')().decode(raw, final=False)
+            return 'utf-8'
+        except UnicodeDecodeError:
+            pass
+        
+        if charset_normalizer is not None:
+            detected = charset_normalizer.detect(raw).get('encoding')
+            if detected:
+                return detected
+        
+        return 'latin1'
+    
+    def _candidate_encodings(self, file_path: str) -> List[str]:
+        """Encoding detectado seguido de latin1, que decodifica qualquer byte"""
+        encoding = self._detect_encoding(file_path)
+        return [encoding] if encoding == 'latin1' else [encoding, 'latin1']
+    
     def _check_csv_file(self, file_path: str) -> Dict:
         """Verificação específica para arquivos CSV"""
         integrity_check = {'format_valid': False, 'rows_count': 0, 'columns_count': 0, 'encoding': 'unknown'}
         
         try:
-            # Tentar diferentes encodings
-            encodings = ['utf-8', 'latin1', 'cp1252', 'iso-8859-1']
-            
-            for encoding in encodings:
+            # Encoding detectado uma vez; latin1 só é usado se o restante do
+            # arquivo não decodificar com o encoding da amostra
+            for encoding in self._candidate_encodings(file_path):
                 try:
                     with open(file_path, 'r', encoding=encoding) as f:
                         # Detectar separador
                         sample = f.read(1024)
                         f.seek(0)
                         
-                        separators = [',', ';', '\t', '|']
-                        separator = ','
-                        for sep in separators:
-                            if sample.count(sep) > sample.count(separator):
-                                separator = sep
+                        # max() mantém o primeiro candidato em caso de empate
+                        separator = max(CSV_SEPARATORS, key=sample.count)
                         
+                        # Contar linhas em streaming, sem materializar o arquivo
                         csv_reader = csv.reader(f, delimiter=separator)
-                        rows = list(csv_reader)
+                        try:
+                            columns_count = len(next(csv_reader))
+                            rows_count = 1 + sum(1 for _ in csv_reader)
+                        except StopIteration:
+                            columns_count = rows_count = 0
                         
                         integrity_check['format_valid'] = True
-                        integrity_check['rows_count'] = len(rows)
-                        integrity_check['columns_count'] = len(rows[0]) if rows else 0
+                        integrity_check['rows_count'] = rows_count
+                        integrity_check['columns_count'] = columns_count
                         integrity_check['encoding'] = encoding
                         integrity_check['separator'] = separator
                         break
@@ -244,7 +738,7 @@ class FileIntegrityChecker:
         
         # Verificação básica primeiro (sem pandas)
         try:
-            file_ext = Path(file_path).suffix.lower()
+            file_ext = get_file_extension(file_path)
             with open(file_path, 'rb') as f:
                 header = f.read(8)
                 
@@ -263,17 +757,104 @@ class FileIntegrityChecker:
             integrity_check['error'] = f"Erro na verificação básica: {e}"
             return integrity_check
         
-        # Verificação avançada com pandas
+        # Verificação avançada: estrutura via openpyxl (somente leitura) para
+        # .xlsx; pandas apenas para .xls ou quando a análise completa é pedida
         try:
-            import pandas as pd
-            import openpyxl
-            
-            integrity_check['verification_level'] = 'advanced'
-            integrity_check['pandas_version'] = pd.__version__
+            if file_ext == '.xlsx' and not self.excel_full_analysis:
+                self._analyze_excel_structure(file_path, integrity_check)
+            else:
+                self._analyze_excel_data(file_path, integrity_check)
+                
+        except ImportError as e:
+            # Pandas não disponível - oferecer instalação
+            missing_modules = []
+            if 'pandas' in str(e):
+                missing_modules.append('pandas')
+            if 'openpyxl' in str(e):
+                missing_modules.append('openpyxl')
+                
+            integrity_check['verification_level'] = 'basic'
+            integrity_check['warning'] = f"Verificação limitada - módulos ausentes: {', '.join(missing_modules)}"
+            integrity_check['enhancement_available'] = True
+            integrity_check['missing_modules'] = missing_modules
             
-            # Verificar estrutura Excel
+            # Se formato básico é válido, mas pandas ausente
+            if integrity_check.get('format_valid'):
+                integrity_check['suggestion'] = "Instale pandas e openpyxl para verificação completa de Excel"
+        
+        return integrity_check
+    
+    def _analyze_excel_structure(self, file_path: str, integrity_check: Dict) -> None:
+        """Analisar planilhas .xlsx com openpyxl em modo somente leitura (sem ler células)"""
+        import openpyxl
+        
+        integrity_check['verification_level'] = 'advanced'
+        integrity_check['analysis_mode'] = 'structure'
+        integrity_check['openpyxl_version'] = openpyxl.__version__
+        
+        try:
+            workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
             try:
-                excel_file = pd.ExcelFile(file_path)
+                integrity_check['sheets_count'] = len(workbook.sheetnames)
+                integrity_check['sheet_names'] = workbook.sheetnames
+                
+                sheets_info = {}
+                total_cells = 0
+                
+                for sheet_name in workbook.sheetnames[:5]:  # Limitar a 5 planilhas
+                    try:
+                        worksheet = workbook[sheet_name]
+                        # Dimensão declarada no arquivo; recalculada se ausente
+                        worksheet.calculate_dimension(force=True)
+                        header = next(worksheet.iter_rows(min_row=1, max_row=1, values_only=True), ())
+                        
+                        # Mesma semântica do pandas: primeira linha é o cabeçalho
+                        if worksheet.max_row <= 1 and all(value is None for value in header):
+                            rows, columns = 0, 0
+                        else:
+                            rows, columns = worksheet.max_row - 1, worksheet.max_column
+                        
+                        column_names = [
+                            value if value is not None else f"Unnamed: {i}"
+                            for i, value in enumerate(header)
+                        ]
+                        sheet_info = {
+                            'rows': rows,
+                            'columns': columns,
+                            'cells': rows * columns,
+                            'has_data': rows > 0 and columns > 0,
+                            'column_names': column_names if columns <= 20 else f"{columns} colunas"
+                        }
+                        
+                        sheets_info[sheet_name] = sheet_info
+                        total_cells += sheet_info['cells']
+                        
+                    except Exception as e:
+                        sheets_info[sheet_name] = {'error': str(e)}
+            finally:
+                # Em modo somente leitura o arquivo fica aberto até close()
+                workbook.close()
+            
+            integrity_check['sheets_info'] = sheets_info
+            integrity_check['total_cells'] = total_cells
+            self._check_excel_structure(integrity_check)
+            
+        except Exception as e:
+            integrity_check['error'] = self._describe_excel_error(e)
+    
+    def _analyze_excel_data(self, file_path: str, integrity_check: Dict) -> None:
+        """Analisar planilhas com pandas, incluindo tipos de dados e células ausentes"""
+        import pandas as pd
+        import openpyxl
+        
+        integrity_check['verification_level'] = 'advanced'
+        integrity_check['analysis_mode'] = 'full'
+        integrity_check['pandas_version'] = pd.__version__
+        
+        # Verificar estrutura Excel
+        try:
+            # O arquivo é aberto uma vez e reaproveitado para todas as planilhas
+            with pd.ExcelFile(file_path) as excel_file:
                 integrity_check['sheets_count'] = len(excel_file.sheet_names)
                 integrity_check['sheet_names'] = excel_file.sheet_names
                 
@@ -283,7 +864,7 @@ class FileIntegrityChecker:
                 
                 for sheet_name in excel_file.sheet_names[:5]:  # Limitar a 5 planilhas
                     try:
-                        df = pd.read_excel(file_path, sheet_name=sheet_name)
+                        df = excel_file.parse(sheet_name)
                         sheet_info = {
                             'rows': len(df),
                             'columns': len(df.columns),
@@ -306,46 +887,32 @@ class FileIntegrityChecker:
                         
                     except Exception as e:
                         sheets_info[sheet_name] = {'error': str(e)}
-                
-                integrity_check['sheets_info'] = sheets_info
-                integrity_check['total_cells'] = total_cells
-                
-                # Verificação de integridade estrutural
-                if integrity_check['sheets_count'] > 0:
-                    integrity_check['structure_valid'] = True
-                else:
-                    integrity_check['structure_valid'] = False
-                    integrity_check['warning'] = "Arquivo Excel sem planilhas válidas"
-                    
-            except pd.errors.EmptyDataError:
-                integrity_check['error'] = "Arquivo Excel vazio"
-            except Exception as e:
-                error_msg = str(e).lower()
-                if 'not a zip file' in error_msg or 'bad zipfile' in error_msg:
-                    integrity_check['error'] = "Arquivo Excel corrompido ou formato inválido"
-                elif 'permission' in error_msg:
-                    integrity_check['error'] = "Sem permissão para acessar arquivo Excel"
-                else:
-                    integrity_check['error'] = f"Erro na análise Excel: {e}"
-                
-        except ImportError as e:
-            # Pandas não disponível - oferecer instalação
-            missing_modules = []
-            if 'pandas' in str(e):
-                missing_modules.append('pandas')
-            if 'openpyxl' in str(e):
-                missing_modules.append('openpyxl')
-                
-            integrity_check['verification_level'] = 'basic'
-            integrity_check['warning'] = f"Verificação limitada - módulos ausentes: {', '.join(missing_modules)}"
-            integrity_check['enhancement_available'] = True
-            integrity_check['missing_modules'] = missing_modules
             
-            # Se formato básico é válido, mas pandas ausente
-            if integrity_check.get('format_valid'):
-                integrity_check['suggestion'] = "Instale pandas e openpyxl para verificação completa de Excel"
-        
-        return integrity_check
+            integrity_check['sheets_info'] = sheets_info
+            integrity_check['total_cells'] = total_cells
+            self._check_excel_structure(integrity_check)
+                
+        except pd.errors.EmptyDataError:
+            integrity_check['error'] = "Arquivo Excel vazio"
+        except Exception as e:
+            integrity_check['error'] = self._describe_excel_error(e)
+    
+    def _check_excel_structure(self, integrity_check: Dict) -> None:
+        """Verificação de integridade estrutural"""
+        if integrity_check['sheets_count'] > 0:
+            integrity_check['structure_valid'] = True
+        else:
+            integrity_check['structure_valid'] = False
+            integrity_check['warning'] = "Arquivo Excel sem planilhas válidas"
+    
+    def _describe_excel_error(self, error: Exception) -> str:
+        """Traduzir erro de leitura do Excel em mensagem amigável"""
+        error_msg = str(error).lower()
+        if 'not a zip file' in error_msg or 'bad zipfile' in error_msg:
+            return "Arquivo Excel corrompido ou formato inválido"
+        elif 'permission' in error_msg:
+            return "Sem permissão para acessar arquivo Excel"
+        return f"Erro na análise Excel: {error}"
     
     def _check_excel_enhancement(self):
         """Verificar e oferecer melhorias para Excel na primeira vez"""
@@ -372,18 +939,21 @@ class FileIntegrityChecker:
         integrity_check = {'format_valid': False, 'pages_count': 0}
         
         try:
-            # Verificação básica de header PDF
             with open(file_path, 'rb') as f:
-                header = f.read(8)
-                if header.startswith(b'%PDF-'):
-                    integrity_check['format_valid'] = True
-                    integrity_check['pdf_version'] = header.decode('ascii', errors='ignore')
+                if os.fstat(f.fileno()).st_size == 0:
+                    integrity_check['has_eof'] = False
+                    return integrity_check
+                
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    # Verificação básica de header PDF
+                    header = mm[:8]
+                    if header.startswith(b'%PDF-'):
+                        integrity_check['format_valid'] = True
+                        integrity_check['pdf_version'] = header.decode('ascii', errors='ignore')
                     
-                # Procurar por trailer (indicativo de PDF bem formado)
-                f.seek(-1024, 2)  # Últimos 1024 bytes
-                tail = f.read()
-                if b'%%EOF' in tail:
-                    integrity_check['has_eof'] = True
+                    # Procurar por trailer (indicativo de PDF bem formado) nos
+                    # últimos 4 KiB, tolerando espaços ou lixo após o %%EOF
+                    integrity_check['has_eof'] = mm.rfind(b'%%EOF', max(0, len(mm) - 4096)) != -1
                     
         except Exception as e:
             integrity_check['error'] = str(e)
@@ -395,25 +965,67 @@ class FileIntegrityChecker:
         integrity_check = {'format_valid': False, 'lines_count': 0, 'encoding': 'unknown'}
         
         try:
-            encodings = ['utf-8', 'latin1', 'cp1252', 'iso-8859-1']
-            
-            for encoding in encodings:
+            for encoding in self._candidate_encodings(file_path):
                 try:
-                    with open(file_path, 'r', encoding=encoding) as f:
-                        lines = f.readlines()
-                        integrity_check['format_valid'] = True
-                        integrity_check['lines_count'] = len(lines)
-                        integrity_check['encoding'] = encoding
-                        integrity_check['char_count'] = sum(len(line) for line in lines)
-                        break
+                    lines_count, char_count, control_count = self._count_text(file_path, encoding)
                 except UnicodeDecodeError:
                     continue
+                
+                integrity_check['format_valid'] = True
+                integrity_check['lines_count'] = lines_count
+                integrity_check['encoding'] = encoding
+                integrity_check['char_count'] = char_count
+                
+                if control_count is not None:
+                    integrity_check['control_chars'] = control_count
+                    if char_count and control_count / char_count > CONTROL_CHARS_WARNING_RATIO:
+                        integrity_check['warning'] = 'Muitos caracteres de controle (possível arquivo binário)'
+                break
                     
         except Exception as e:
             integrity_check['error'] = str(e)
         
         return integrity_check
     
+    def _count_text(self, file_path: str, encoding: str) -> Tuple[int, int, Optional[int]]:
+        """Contar linhas, caracteres e bytes de controle lendo o arquivo em blocos binários"""
+        # Em latin1 cada byte é um caractere, então não é preciso decodificar;
+        # nos demais encodings o decoder incremental valida o conteúdo
+        codec_name = codecs.lookup(encoding).name
+        single_byte = codec_name == 'iso8859-1'
+        decoder = None if single_byte else codecs.getincrementaldecoder(encoding)()
+        # Bytes de controle só fazem sentido em encodings compatíveis com ASCII
+        control_count = None if codec_name.startswith(('utf-16', 'utf-32')) else 0
+        # Quebras como nas "universal newlines" do modo texto: \n, \r\n e \r
+        lf, cr, crlf = (b'\n', b'\r', b'\r\n') if decoder is None else ('\n', '\r', '\r\n')
+        lines_count = 0
+        char_count = 0
+        last_char = lf[:0]
+        
+        with open(file_path, 'rb', buffering=0) as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                if control_count is not None:
+                    control_count += count_control_bytes(chunk)
+                
+                text = chunk if decoder is None else decoder.decode(chunk)
+                if not text:
+                    continue
+                lines_count += text.count(lf) + text.count(cr) - text.count(crlf)
+                # \r\n dividido entre dois blocos é uma única quebra
+                if last_char == cr and text[:1] == lf:
+                    lines_count -= 1
+                char_count += len(text)
+                last_char = text[-1:]
+        
+        if decoder is not None:
+            decoder.decode(b'', final=True)
+        
+        # Última linha sem quebra de linha também conta, como em readlines()
+        if last_char and last_char not in (lf, cr):
+            lines_count += 1
+        
+        return lines_count, char_count, control_count
+    
     def _check_python_file(self, file_path: str) -> Dict:
         """Verificação específica para arquivos Python"""
         integrity_check = {'format_valid': False, 'syntax_valid': False}
@@ -447,11 +1059,8 @@ class FileIntegrityChecker:
             integrity_check['format_valid'] = True
             integrity_check['lines_count'] = len(content.splitlines())
             
-            # Contar statements básicos
-            statements = content.upper().count('SELECT') + content.upper().count('INSERT') + \
-                        content.upper().count('UPDATE') + content.upper().count('DELETE') + \
-                        content.upper().count('CREATE') + content.upper().count('DROP')
-            integrity_check['statements_count'] = statements
+            # Contar statements básicos em uma única passada
+            integrity_check['statements_count'] = sum(1 for _ in SQL_STATEMENT_RE.finditer(content))
             
         except Exception as e:
             integrity_check['error'] = str(e)
@@ -465,10 +1074,20 @@ class FileIntegrityChecker:
         try:
             import xml.etree.ElementTree as ET
             
-            tree = ET.parse(file_path)
+            # Parse incremental: só precisamos saber se o documento é bem
+            # formado e qual a tag raiz, sem montar a árvore em memória
+            context = ET.iterparse(file_path, events=('start', 'end'))
+            _, root = next(context)
+            root_tag = root.tag
+            
+            for event, elem in context:
+                if event == 'end':
+                    elem.clear()
+                    root.clear()
+            
             integrity_check['format_valid'] = True
             integrity_check['well_formed'] = True
-            integrity_check['root_tag'] = tree.getroot().tag
+            integrity_check['root_tag'] = root_tag
             
         except ImportError:
             integrity_check['error'] = "xml.etree não disponível"
@@ -488,8 +1107,16 @@ class FileIntegrityChecker:
             import zipfile
             
             with zipfile.ZipFile(file_path, 'r') as zip_file:
-                # Testar integridade do ZIP
-                bad_file = zip_file.testzip()
+                # Abrir o ZIP já valida o diretório central. A verificação
+                # profunda descompacta tudo para conferir o CRC; a rápida só
+                # confere os cabeçalhos locais contra o diretório central
+                if self.deep_verification:
+                    integrity_check['verification_level'] = 'deep'
+                    bad_file = zip_file.testzip()
+                else:
+                    integrity_check['verification_level'] = 'quick'
+                    bad_file = self._check_zip_local_headers(file_path, zip_file.infolist())
+                
                 integrity_check['format_valid'] = True
                 integrity_check['is_corrupted'] = bad_file is not None
                 integrity_check['files_count'] = len(zip_file.namelist())
@@ -502,6 +1129,23 @@ class FileIntegrityChecker:
         
         return integrity_check
     
+    def _check_zip_local_headers(self, file_path: str, infos: List) -> Optional[str]:
+        """Conferir assinatura e CRC dos cabeçalhos locais sem descompactar"""
+        with open(file_path, 'rb') as f:
+            for info in infos:
+                f.seek(info.header_offset)
+                header = f.read(30)
+                if len(header) < 30 or header[:4] != b'PK\x03\x04':
+                    return info.filename
+                
+                # Com o bit 3 ligado o CRC fica no descritor após os dados
+                if not info.flag_bits & 0x08:
+                    crc = struct.unpack('<I', header[14:18])[0]
+                    if crc != info.CRC:
+                        return info.filename
+        
+        return None
+    
     def _check_rar_file(self, file_path: str) -> Dict:
         """Verificação específica para arquivos RAR"""
         integrity_check = {'format_valid': False}
@@ -519,87 +1163,322 @@ class FileIntegrityChecker:
         
         return integrity_check
     
-    def check_file_integrity(self, file_path: str) -> Dict:
+    def check_file_integrity(self, file_path: str, stat_info: Optional[os.stat_result] = None) -> FileResult:
         """Verificar integridade de um arquivo específico"""
-        logging.info(f"Verificando arquivo: {file_path}")
+        logger.debug("Verificando arquivo: %s", file_path)
+        
+        file_ext = get_file_extension(file_path)
+        
+        # Reaproveitar resultado de execuções anteriores se o arquivo não mudou
+        if self.cache is not None:
+            profile = self._verification_profile(file_ext)
+            if stat_info is None:
+                try:
+                    stat_info = os.stat(file_path)
+                except OSError:
+                    pass
+            if stat_info is not None:
+                cached = self._get_cached_result(file_path, stat_info, profile)
+                if cached is not None:
+                    if file_ext in EXCEL_EXTENSIONS:
+                        self._register_excel_file()
+                    return cached
         
         # Verificação básica
-        result = self._check_basic_accessibility(file_path)
+        result = self._check_basic_accessibility(file_path, stat_info)
         
         # Se arquivo não está acessível, retornar resultado básico
-        if not result['is_accessible']:
-            result['integrity_status'] = 'INACCESSIBLE'
+        if not result.is_accessible:
+            result.integrity_status = 'INACCESSIBLE'
             return result
         
-        # Calcular hash do arquivo
-        result['md5_hash'] = self.calculate_file_hash(file_path, 'md5')
-        result['sha256_hash'] = self.calculate_file_hash(file_path, 'sha256')
+        # Calcular hash do arquivo. SHA256 via OpenSSL usa instruções SHA-NI
+        # quando disponíveis; BLAKE3 e XXH3 usam SIMD e são mais rápidos em
+        # arquivos grandes. MD5 só é calculado para comparação com legado
+        if self.fast_mode and result.file_size > FAST_MODE_THRESHOLD:
+            result.sha256_fingerprint = self.calculate_file_fingerprint(file_path, result.file_size)
+            file_digest = result.sha256_fingerprint
+        else:
+            algorithms = ('md5', self.hash_algorithm) if self.legacy_md5 else (self.hash_algorithm,)
+            # O cache só é liberado para arquivos grandes que nenhuma
+            # verificação específica vai reler logo em seguida
+            drop_cache = result.file_size > DROP_CACHE_THRESHOLD and file_ext not in self.file_handlers
+            hashes = self.calculate_file_hashes(file_path, algorithms, drop_cache=drop_cache,
+                                                file_size=result.file_size)
+            if self.legacy_md5:
+                result.md5_hash = hashes['md5']
+            file_digest = hashes[self.hash_algorithm]
+            setattr(result, self._hash_field, file_digest)
         
-        # Verificação específica por tipo de arquivo
-        file_ext = Path(file_path).suffix.lower()
+        if file_digest is None:
+            result.is_readable = False
         
-        # Verificar se é arquivo Excel e ativar melhorias se necessário
-        if file_ext in ['.xlsx', '.xls']:
+        # Verificar se é arquivo Excel e ativar melhorias se necessário.
+        # Na varredura em paralelo a decisão já foi tomada na thread principal
+        # (_resolve_excel_dependencies), e aqui resta só a contagem
+        if file_ext in EXCEL_EXTENSIONS:
             self._check_excel_enhancement()
-            self.summary['excel_files'] += 1
+            self._register_excel_file()
         
+        # Verificação específica por tipo de arquivo
         if file_ext in self.file_handlers:
             specific_check = self.file_handlers[file_ext](file_path)
-            result['specific_checks'] = specific_check
+            result.specific_checks = specific_check
         else:
-            result['specific_checks'] = {'format': 'unknown', 'message': 'Tipo de arquivo não reconhecido'}
+            result.specific_checks = {'format': 'unknown', 'message': 'Tipo de arquivo não reconhecido'}
         
         # Determinar status de integridade
-        if result['is_readable']:
-            if result['file_size'] == 0:
+        if result.is_readable:
+            if result.file_size == 0:
                 # Arquivos vazios são considerados suspeitos, mas não necessariamente corrompidos
-                result['integrity_status'] = 'UNKNOWN'
-                result['warning'] = 'Arquivo vazio'
-            elif 'specific_checks' in result and 'error' not in result['specific_checks']:
-                result['integrity_status'] = 'INTACT'
-            elif 'specific_checks' in result and 'error' in result['specific_checks']:
-                result['integrity_status'] = 'CORRUPTED'
+                result.integrity_status = 'UNKNOWN'
+                result.warning = 'Arquivo vazio'
+            elif result.specific_checks is not None and 'error' not in result.specific_checks:
+                result.integrity_status = 'INTACT'
+            elif result.specific_checks is not None and 'error' in result.specific_checks:
+                result.integrity_status = 'CORRUPTED'
             else:
-                result['integrity_status'] = 'INTACT'  # Se é legível e tem conteúdo, assumir íntegro
+                result.integrity_status = 'INTACT'  # Se é legível e tem conteúdo, assumir íntegro
         else:
-            result['integrity_status'] = 'CORRUPTED'
+            result.integrity_status = 'CORRUPTED'
+        
+        # Falhas de leitura podem ser transitórias e não vão para o cache
+        if self.cache is not None and stat_info is not None and file_digest is not None:
+            self.cache.put(os.path.abspath(file_path), stat_info.st_mtime_ns, stat_info.st_ctime_ns,
+                           stat_info.st_size, profile, result.to_dict())
         
         return result
     
+    def check_many(self, file_paths: Iterable[str]) -> List[FileResult]:
+        """Verificar vários arquivos de uma vez, em lotes e em paralelo
+        
+        Assim como check_file_integrity, não altera self.results nem o sumário.
+        A ordem dos resultados pode diferir da entrada (arquivos pequenos são
+        agrupados); use FileResult.file_path para associá-los.
+        """
+        results = []
+        self._check_files(self._stat_entries(map(PathEntry, file_paths)), results.append)
+        return results
+    
+    def _verification_profile(self, file_ext: str) -> str:
+        """Opções e módulos dos quais depende a verificação específica do tipo"""
+        if file_ext == '.zip':
+            return f'deep={int(self.deep_verification)}'
+        if file_ext in EXCEL_EXTENSIONS:
+            # A instalação opcional é decidida antes, para o perfil refletir
+            # os módulos efetivamente usados nesta execução
+            self._check_excel_enhancement()
+            if self._excel_modules_profile is None:
+                self._excel_modules_profile = ':'.join(
+                    f'{name}={int(module_available(name))}' for name in ('pandas', 'openpyxl', 'xlrd')
+                )
+            return f'excel_full={int(self.excel_full_analysis)}:{self._excel_modules_profile}'
+        return ''
+    
+    def _get_cached_result(self, file_path: str, stat_info: os.stat_result,
+                           profile: str) -> Optional[FileResult]:
+        """Buscar no cache um resultado compatível com as opções atuais"""
+        cached = self.cache.get(os.path.abspath(file_path), stat_info.st_mtime_ns, stat_info.st_ctime_ns,
+                                stat_info.st_size, profile)
+        if cached is None:
+            return None
+        
+        cached = FileResult.from_dict(cached)
+        # Impressões digitais do modo rápido não substituem o hash completo,
+        # e um hash de outro algoritmo não serve para a execução atual
+        if getattr(cached, self._hash_field) is None:
+            if not (self.fast_mode and cached.sha256_fingerprint is not None):
+                return None
+        if self.legacy_md5 and cached.md5_hash is None:
+            return None
+        
+        # Acesso e permissões valem como estão agora; se o arquivo deixou de
+        # ser legível, a verificação é refeita para recalcular o status
+        if not os.access(file_path, os.R_OK):
+            return None
+        cached.permissions = oct(stat_info.st_mode)[-3:]
+        cached.is_readable = True
+        
+        cached.file_path = file_path
+        return cached
+    
+    def _register_excel_file(self) -> None:
+        """Contabilizar arquivo Excel (chamado também pelas threads do pool)"""
+        with self._lock:
+            self.summary['excel_files'] += 1
+    
+    def _resolve_excel_dependencies(self, items: Iterable[Tuple[str, Optional[os.stat_result]]]
+                                    ) -> Iterator[Tuple[str, Optional[os.stat_result]]]:
+        """Oferecer as dependências de Excel na thread principal, ao surgir o primeiro arquivo Excel"""
+        # A pergunta (input) e o pip install acontecem antes de o arquivo ir
+        # para o pool, sem workers presos esperando a resposta do usuário
+        for item in items:
+            if not self.excel_enhancement_checked and get_file_extension(item[0]) in EXCEL_EXTENSIONS:
+                self._check_excel_enhancement()
+            yield item
+    
     def scan_directories(self) -> None:
         """Escanear todos os diretórios especificados"""
-        logging.info(f"Iniciando verificação de integridade em {len(self.directories)} diretórios")
+        logger.info(f"Iniciando verificação de integridade em {len(self.directories)} diretórios")
         
+        # Descoberta e verificação se sobrepõem: arquivos vão para o pool
+        # conforme o percurso avança
+        self._check_files(self._stat_entries(self._iter_scan_entries()))
+        
+        logger.info(f"Verificação concluída. Total de arquivos: {self.summary['total_files']}")
+    
+    def _iter_scan_entries(self) -> Iterator[os.DirEntry]:
+        """Percorrer recursivamente todos os diretórios configurados"""
         for directory in self.directories:
-            logging.info(f"Escaneando diretório: {directory}")
+            logger.info(f"Escaneando diretório: {directory}")
             
             if not os.path.exists(directory):
-                logging.warning(f"Diretório não encontrado: {directory}")
+                logger.warning(f"Diretório não encontrado: {directory}")
                 continue
             
-            # Percorrer recursivamente o diretório
-            for root, dirs, files in os.walk(directory):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    
-                    try:
-                        result = self.check_file_integrity(file_path)
-                        self.results.append(result)
-                        
-                        # Atualizar sumário
-                        self.summary['total_files'] += 1
-                        
-                        if result['integrity_status'] == 'INTACT':
-                            self.summary['intact_files'] += 1
-                        elif result['integrity_status'] == 'CORRUPTED':
-                            self.summary['corrupted_files'] += 1
-                        elif result['integrity_status'] == 'INACCESSIBLE':
-                            self.summary['inaccessible_files'] += 1
-                            
-                    except Exception as e:
-                        logging.error(f"Erro ao processar arquivo {file_path}: {e}")
+            yield from self._iter_file_entries(directory)
+    
+    def _iter_file_entries(self, directory: str) -> Iterator[os.DirEntry]:
+        """Percorrer o diretório recursivamente com os.scandir"""
+        pending = [directory]
+        
+        while pending:
+            current = pending.pop()
+            try:
+                with os.scandir(current) as it:
+                    for entry in it:
+                        # Mesma semântica do os.walk: links para diretórios
+                        # não são seguidos nem verificados como arquivos
+                        if entry.is_dir():
+                            if not entry.is_symlink():
+                                pending.append(entry.path)
+                        else:
+                            yield entry
+            except OSError as e:
+                logger.warning(f"Não foi possível ler o diretório {current}: {e}")
+    
+    def _stat_entries(self, entries: Iterable[os.DirEntry]) -> Iterator[Tuple[str, Optional[os.stat_result]]]:
+        """Associar cada entrada ao seu stat, reaproveitado por toda a verificação"""
+        entries = iter(entries)
+        chunk = list(islice(entries, STAT_BATCH_SIZE))
+        if len(chunk) < STAT_BATCH_SIZE:
+            # Tudo cabe em um bloco: não há o que sobrepor, stat direto
+            yield from zip((entry.path for entry in chunk), self._stat_batch(chunk))
+            return
         
-        logging.info(f"Verificação concluída. Total de arquivos: {self.summary['total_files']}")
+        # Cada bloco é uma única tarefa: o percurso segue descobrindo entradas
+        # enquanto até STAT_WORKERS blocos têm seus stats obtidos em paralelo
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=STAT_WORKERS) as executor:
+            while chunk or pending:
+                if chunk:
+                    pending.append((chunk, executor.submit(self._stat_batch, chunk)))
+                if pending and (not chunk or len(pending) >= STAT_WORKERS):
+                    done_chunk, future = pending.popleft()
+                    yield from zip((entry.path for entry in done_chunk), future.result())
+                if chunk:
+                    chunk = list(islice(entries, STAT_BATCH_SIZE))
+    
+    def _stat_batch(self, entries: List[os.DirEntry]) -> List[Optional[os.stat_result]]:
+        """Obter o stat de um bloco de entradas"""
+        return [stat_entry(entry) for entry in entries]
+    
+    def _batch_files(self, items: Iterable[Tuple[str, Optional[os.stat_result]]]
+                     ) -> Iterator[List[Tuple[str, Optional[os.stat_result]]]]:
+        """Agrupar arquivos pequenos em lotes; arquivos grandes ficam isolados"""
+        small_batch = []
+        
+        for item in items:
+            stat_info = item[1]
+            if stat_info is not None and stat_info.st_size < SMALL_FILE_THRESHOLD:
+                small_batch.append(item)
+                if len(small_batch) == SMALL_FILE_BATCH_SIZE:
+                    yield small_batch
+                    small_batch = []
+            else:
+                yield [item]
+        
+        if small_batch:
+            yield small_batch
+    
+    def _check_file_batch(self, items: List[Tuple[str, Optional[os.stat_result]]]) -> List[FileResult]:
+        """Verificar um lote de arquivos dentro de uma única tarefa"""
+        results = []
+        for file_path, stat_info in items:
+            try:
+                results.append(self.check_file_integrity(file_path, stat_info))
+            except Exception as e:
+                logger.error(f"Erro ao processar arquivo {file_path}: {e}")
+        return results
+    
+    def _check_files(self, items: Iterable[Tuple[str, Optional[os.stat_result]]],
+                     handle_result: Optional[Callable[[FileResult], None]] = None) -> None:
+        """Verificar arquivos em paralelo e consolidar os resultados
+        
+        Cada resultado é entregue a handle_result na thread principal; por
+        padrão, _record_result (lista de resultados e sumário).
+        """
+        if handle_result is None:
+            handle_result = self._record_result
+        batches = self._batch_files(self._resolve_excel_dependencies(items))
+        first_batches = list(islice(batches, 2))
+        
+        if len(first_batches) < 2:
+            # Entrada pequena (um único lote): verificar sem criar o pool
+            for batch in first_batches:
+                for result in self._check_file_batch(batch):
+                    handle_result(result)
+        else:
+            self._check_batches_parallel(chain(first_batches, batches), handle_result)
+        
+        if self.cache is not None:
+            self.cache.flush()
+    
+    def _check_batches_parallel(self, batches: Iterable[List[Tuple[str, Optional[os.stat_result]]]],
+                                handle_result: Callable[[FileResult], None]) -> None:
+        """Verificar lotes no pool de threads com janela limitada de envio"""
+        # Hash e parsers bloqueiam em leitura de disco (liberando o GIL),
+        # então threads permitem sobrepor o I/O de vários arquivos. Arquivos
+        # pequenos vão em lotes para diluir o custo de agendamento por tarefa
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = set()
+            for batch in batches:
+                # Janela limitada: aguarda algum lote terminar antes de enviar mais
+                if len(pending) >= MAX_PENDING_BATCHES:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    self._collect_batches(done, handle_result)
+                pending.add(executor.submit(self._check_file_batch, batch))
+            
+            self._collect_batches(as_completed(pending), handle_result)
+    
+    def _collect_batches(self, futures: Iterable, handle_result: Callable[[FileResult], None]) -> None:
+        """Consolidar lotes concluídos; executado apenas na thread principal"""
+        for future in futures:
+            try:
+                results = future.result()
+            except Exception as e:
+                logger.error(f"Erro ao processar lote de arquivos: {e}")
+                continue
+            
+            for result in results:
+                handle_result(result)
+    
+    def _record_result(self, result: FileResult) -> None:
+        """Registrar resultado de um arquivo e atualizar sumário"""
+        self.results.append(result)
+        summary = self.summary
+        summary['total_files'] += 1
+        
+        status_key = self._STATUS_KEYS.get(result.integrity_status)
+        if status_key is not None:
+            summary[status_key] += 1
+        
+        self._report_progress()
+    
+    def _report_progress(self) -> None:
+        """Informar o progresso da varredura (chamado a cada arquivo registrado)"""
+        if self.summary['total_files'] % PROGRESS_LOG_INTERVAL == 0:
+            logger.info(f"Progresso: {self.summary['total_files']} arquivos verificados")
     
     def generate_report(self, output_file: str = None) -> None:
         """Gerar relatório de integridade"""
@@ -608,61 +1487,45 @@ class FileIntegrityChecker:
             output_file = f"integrity_report_{timestamp}"
         
         if self.output_format == 'json':
-            report = {
-                'summary': self.summary,
-                'details': self.results
-            }
-            
+            # Mesma estrutura {'summary', 'details'}, mas escrita registro a
+            # registro para não montar o relatório inteiro em memória
             json_file = f"{output_file}.json"
-            with open(json_file, 'w', encoding='utf-8') as f:
-                json.dump(report, f, indent=2, ensure_ascii=False)
+            with open(json_file, 'wb') as f:
+                f.write(b'{\n  "summary": ')
+                f.write(json_dumps_bytes(self.summary))
+                f.write(b',\n  "details": [')
+                for i, result in enumerate(self.results):
+                    f.write(b'\n    ' if i == 0 else b',\n    ')
+                    f.write(json_dumps_bytes(result.to_dict()))
+                f.write(b'\n  ]\n}\n' if self.results else b']\n}\n')
             
-            logging.info(f"Relatório JSON gerado: {json_file}")
+            logger.info(f"Relatório JSON gerado: {json_file}")
         
         elif self.output_format == 'csv':
             csv_file = f"{output_file}.csv"
             
             if self.results:
-                # Flatten dos resultados para CSV
-                flattened_results = []
-                all_fields = set()
+                # Colunas specific_* dependem das verificações de cada tipo
+                specific_keys = sorted({
+                    key for result in self.results if result.specific_checks
+                    for key in result.specific_checks
+                })
+                base_values = attrgetter(*CSV_REPORT_FIELDS)
                 
-                # Primeira passada para coletar todos os campos possíveis
-                for result in self.results:
-                    flat_result = {
-                        'file_path': result.get('file_path', ''),
-                        'file_name': result.get('file_name', ''),
-                        'file_size': result.get('file_size', 0),
-                        'integrity_status': result.get('integrity_status', ''),
-                        'is_accessible': result.get('is_accessible', False),
-                        'is_readable': result.get('is_readable', False),
-                        'last_modified': result.get('last_modified', ''),
-                        'md5_hash': result.get('md5_hash', ''),
-                        'error': result.get('error', ''),
-                    }
-                    
-                    # Adicionar informações específicas se existirem
-                    if 'specific_checks' in result:
-                        for key, value in result['specific_checks'].items():
-                            flat_result[f'specific_{key}'] = str(value) if value is not None else ''
-                    
-                    flattened_results.append(flat_result)
-                    all_fields.update(flat_result.keys())
-                
-                # Garantir que todos os registros tenham todos os campos
-                for flat_result in flattened_results:
-                    for field in all_fields:
-                        if field not in flat_result:
-                            flat_result[field] = ''
-                
-                # Escrever CSV
+                # Escrever CSV registro a registro; campos ausentes saem vazios
                 with open(csv_file, 'w', newline='', encoding='utf-8') as f:
-                    if flattened_results:
-                        writer = csv.DictWriter(f, fieldnames=sorted(all_fields))
-                        writer.writeheader()
-                        writer.writerows(flattened_results)
+                    writer = csv.writer(f)
+                    writer.writerow(CSV_REPORT_FIELDS + tuple(f'specific_{key}' for key in specific_keys))
+                    
+                    for result in self.results:
+                        checks = result.specific_checks or {}
+                        row = [('' if value is None else value) for value in base_values(result)]
+                        for key in specific_keys:
+                            value = checks.get(key)
+                            row.append('' if value is None else str(value))
+                        writer.writerow(row)
                 
-                logging.info(f"Relatório CSV gerado: {csv_file}")
+                logger.info(f"Relatório CSV gerado: {csv_file}")
         
         # Sempre gerar sumário em texto
         summary_file = f"{output_file}_summary.txt"
@@ -674,23 +1537,22 @@ class FileIntegrityChecker:
             f.write(f"Arquivos corrompidos: {self.summary['corrupted_files']}\n")
             f.write(f"Arquivos inacessíveis: {self.summary['inaccessible_files']}\n\n")
             
-            if self.summary['total_files'] > 0:
-                intact_pct = (self.summary['intact_files'] / self.summary['total_files']) * 100
-                corrupted_pct = (self.summary['corrupted_files'] / self.summary['total_files']) * 100
-                f.write(f"Percentual de arquivos íntegros: {intact_pct:.1f}%\n")
-                f.write(f"Percentual de arquivos corrompidos: {corrupted_pct:.1f}%\n\n")
+            percentages = compute_summary_percentages(self.summary)
+            if percentages is not None:
+                f.write(f"Percentual de arquivos íntegros: {percentages.intact:.1f}%\n")
+                f.write(f"Percentual de arquivos corrompidos: {percentages.corrupted:.1f}%\n\n")
             
             # Listar arquivos corrompidos
             if self.summary['corrupted_files'] > 0:
                 f.write("=== ARQUIVOS CORROMPIDOS ===\n")
                 for result in self.results:
-                    if result['integrity_status'] == 'CORRUPTED':
-                        f.write(f"- {result['file_path']}\n")
-                        if result.get('error'):
-                            f.write(f"  Erro: {result['error']}\n")
+                    if result.integrity_status == 'CORRUPTED':
+                        f.write(f"- {result.file_path}\n")
+                        if result.error:
+                            f.write(f"  Erro: {result.error}\n")
                 f.write("\n")
         
-        logging.info(f"Sumário gerado: {summary_file}")
+        logger.info(f"Sumário gerado: {summary_file}")
 
 
 def main():
@@ -700,6 +1562,23 @@ def main():
     parser.add_argument('--format', choices=['json', 'csv'], default='json', 
                         help='Formato do relatório de saída (padrão: json)')
     parser.add_argument('--output', help='Nome base do arquivo de saída (sem extensão)')
+    parser.add_argument('--hash', choices=HASH_ALGORITHMS, default=DEFAULT_HASH_ALGORITHM,
+                        help='Algoritmo do hash principal; blake3 e xxh3 exigem os pacotes '
+                             f'opcionais blake3/xxhash (padrão: {DEFAULT_HASH_ALGORITHM})')
+    parser.add_argument('--legacy-md5', action='store_true',
+                        help='Calcular também o hash MD5 (compatibilidade com relatórios antigos)')
+    parser.add_argument('--fast', action='store_true',
+                        help='Arquivos acima de 100 MiB recebem apenas impressão digital '
+                             '(tamanho + início + fim) em vez do hash completo')
+    parser.add_argument('--excel-full', action='store_true',
+                        help='Analisar dados das planilhas .xlsx com pandas (tipos e células ausentes)')
+    parser.add_argument('--deep', action='store_true',
+                        help='Descompactar arquivos ZIP inteiros para conferir o CRC de cada entrada')
+    parser.add_argument('--cache', nargs='?', const=DEFAULT_CACHE_FILE, metavar='ARQUIVO',
+                        help='Reaproveitar resultados de arquivos não modificados entre execuções '
+                             f'(padrão: {DEFAULT_CACHE_FILE})')
+    parser.add_argument('--workers', type=int, default=DEFAULT_MAX_WORKERS,
+                        help=f'Número de threads de verificação (padrão: {DEFAULT_MAX_WORKERS})')
     
     args = parser.parse_args()
     
@@ -709,14 +1588,17 @@ def main():
         if os.path.exists(directory):
             valid_directories.append(directory)
         else:
-            logging.warning(f"Diretório não encontrado: {directory}")
+            logger.warning(f"Diretório não encontrado: {directory}")
     
     if not valid_directories:
-        logging.error("Nenhum diretório válido fornecido")
+        logger.error("Nenhum diretório válido fornecido")
         sys.exit(1)
     
     # Criar verificador e executar
-    checker = FileIntegrityChecker(valid_directories, args.format)
+    checker = FileIntegrityChecker(valid_directories, args.format, max_workers=args.workers,
+                                   legacy_md5=args.legacy_md5, cache_path=args.cache,
+                                   fast_mode=args.fast, excel_full_analysis=args.excel_full,
+                                   deep_verification=args.deep, hash_algorithm=args.hash)
     checker.scan_directories()
     checker.generate_report(args.output)
     
@@ -7,19 +7,29 @@ Script que solicita parâmetros do usuário antes da execução
 import os
 import sys
 import json
+import time
 from datetime import datetime
-from pathlib import Path
-from script import FileIntegrityChecker
+from operator import attrgetter
+from script import DEFAULT_CACHE_FILE, FileIntegrityChecker, compute_summary_percentages
+
+# Intervalo mínimo, em segundos, entre atualizações da linha de progresso
+PROGRESS_INTERVAL = 1.0
+
+# Tabela que remove caracteres inválidos em nomes de arquivo (verificação em C)
+INVALID_FILENAME_CHARS = str.maketrans('', '', '<>:"/\\|?*')
 
 class InteractiveFileChecker:
     """Classe para interface interativa do verificador"""
     
     def __init__(self):
         self.directories = []
+        # Caminhos reais já adicionados (links para o mesmo diretório contam uma vez)
+        self._directory_keys = set()
         self.output_name = None
         self.recursive = True
         self.file_types = []
         self.auto_install_excel = False
+        self.use_cache = True
         
     def print_header(self):
         """Exibir cabeçalho do programa"""
@@ -85,7 +95,9 @@ class InteractiveFileChecker:
             valid, message = self.validate_directory(user_input)
             if valid:
                 abs_path = os.path.abspath(user_input)
-                if abs_path not in self.directories:
+                real_path = os.path.realpath(abs_path)
+                if real_path not in self._directory_keys:
+                    self._directory_keys.add(real_path)
                     self.directories.append(abs_path)
                     print(f"✅ Diretório adicionado: {abs_path}")
                 else:
@@ -114,7 +126,7 @@ class InteractiveFileChecker:
                 break
             
             # Validar nome do arquivo
-            if any(char in output_input for char in '<>:"/\\|?*'):
+            if len(output_input.translate(INVALID_FILENAME_CHARS)) != len(output_input):
                 print("❌ Nome contém caracteres inválidos. Tente novamente.")
                 continue
             
@@ -196,6 +208,26 @@ class InteractiveFileChecker:
             else:
                 print("❌ Digite 's' para sim ou 'n' para não")
     
+    def get_cache_options(self):
+        """Configurar reaproveitamento de resultados entre execuções"""
+        print("\n💾 CACHE DE VERIFICAÇÕES")
+        print("-" * 24)
+        print("Arquivos sem alteração de tamanho e data desde a última verificação")
+        print(f"podem reaproveitar o resultado salvo em '{DEFAULT_CACHE_FILE}'.")
+        
+        while True:
+            cache_input = input("Reaproveitar resultados de verificações anteriores? (S/n): ").strip().lower()
+            if cache_input in ['', 's', 'sim', 'yes', 'y']:
+                self.use_cache = True
+                print("✅ Cache ativado")
+                break
+            elif cache_input in ['n', 'nao', 'não', 'no']:
+                self.use_cache = False
+                print("✅ Todos os arquivos serão verificados novamente")
+                break
+            else:
+                print("❌ Digite 's' para sim ou 'n' para não")
+    
     def show_summary(self):
         """Exibir resumo das configurações"""
         print("\n📋 RESUMO DAS CONFIGURAÇÕES")
@@ -210,6 +242,7 @@ class InteractiveFileChecker:
         else:
             print("Filtros: Nenhum (todos os arquivos)")
         print(f"Auto-instalar Excel: {'Sim' if self.auto_install_excel else 'Não'}")
+        print(f"Cache: {DEFAULT_CACHE_FILE if self.use_cache else 'Desativado'}")
         print("=" * 30)
     
     def confirm_execution(self):
@@ -228,10 +261,15 @@ class InteractiveFileChecker:
         print("\n🔍 EXECUTANDO VERIFICAÇÃO DE INTEGRIDADE")
         print("=" * 45)
         
-        # Criar verificador customizado
-        checker = CustomFileChecker(self.directories, self.recursive, self.file_types, self.auto_install_excel)
-        
         try:
+            # Criar verificador customizado; se o cache não puder ser aberto
+            # (diretório sem escrita, arquivo inválido), segue sem ele
+            cache_path = DEFAULT_CACHE_FILE if self.use_cache else None
+            checker = CustomFileChecker(self.directories, self.recursive, self.file_types,
+                                        self.auto_install_excel, cache_path=cache_path)
+            if cache_path and checker.cache is None:
+                print(f"⚠️  Não foi possível usar o cache ({cache_path}); verificação seguirá sem cache")
+            
             # Executar verificação
             print("Iniciando verificação...")
             checker.scan_directories()
@@ -248,9 +286,9 @@ class InteractiveFileChecker:
             print(f"Arquivos corrompidos: {checker.summary['corrupted_files']}")
             print(f"Arquivos inacessíveis: {checker.summary['inaccessible_files']}")
             
-            if checker.summary['total_files'] > 0:
-                intact_pct = (checker.summary['intact_files'] / checker.summary['total_files']) * 100
-                print(f"Taxa de integridade: {intact_pct:.1f}%")
+            percentages = compute_summary_percentages(checker.summary)
+            if percentages is not None:
+                print(f"Taxa de integridade: {percentages.intact:.1f}%")
             
             print(f"\n📄 Relatório salvo em: {self.output_name}.txt")
             
@@ -268,6 +306,7 @@ class InteractiveFileChecker:
             self.get_directories()
             self.get_output_settings()
             self.get_filter_options()
+            self.get_cache_options()
             self.show_summary()
             
             if self.confirm_execution():
@@ -291,24 +330,53 @@ class InteractiveFileChecker:
 class CustomFileChecker(FileIntegrityChecker):
     """Versão customizada do verificador para interface interativa"""
     
-    def __init__(self, directories, recursive=True, file_types=None, auto_install_excel=False):
-        super().__init__(directories, output_format='txt', auto_install_excel=auto_install_excel)
+    # Símbolo de cada status na lista completa do relatório em texto
+    _STATUS_SYMBOLS = {
+        'INTACT': '  ✅   ',
+        'CORRUPTED': '  ❌   ',
+        'INACCESSIBLE': '  🚫   ',
+        'UNKNOWN': '  ❓   '
+    }
+    
+    def __init__(self, directories, recursive=True, file_types=None, auto_install_excel=False, cache_path=None):
+        super().__init__(directories, output_format='txt', auto_install_excel=auto_install_excel,
+                         cache_path=cache_path)
         self.recursive = recursive
         self.file_types = file_types or []
+        self._ext_set = frozenset(ext.lower() for ext in self.file_types)
+        # Tupla para str.endswith, que testa todos os sufixos em C
+        self._ext_suffixes = tuple(self._ext_set)
+        self._last_progress = 0.0
+        self._progress_shown = False
     
     def should_check_file(self, file_path):
         """Verificar se arquivo deve ser processado baseado nos filtros"""
-        if not self.file_types:
+        return self._accepts_name(os.path.basename(file_path))
+    
+    def _accepts_name(self, name):
+        """Aplicar o filtro de extensões ao nome do arquivo"""
+        if not self._ext_suffixes:
             return True
         
-        file_ext = Path(file_path).suffix.lower()
-        return file_ext in self.file_types
+        name = name.lower()
+        # Nomes como ".txt" são arquivos ocultos sem extensão
+        return name.endswith(self._ext_suffixes) and name.rfind('.') > 0
     
     def scan_directories(self):
         """Escanear diretórios com suporte a filtros"""
         print(f"Iniciando verificação de integridade em {len(self.directories)} diretórios")
         
+        # Arquivos selecionados seguem direto para o pool de verificação
+        self._last_progress = time.monotonic()
+        self._check_files(self._stat_entries(self._iter_selected_files()))
+        
+        self._end_progress_line()
+        print(f"Verificação concluída. Total: {self.summary['total_files']} arquivos")
+    
+    def _iter_selected_files(self):
+        """Listar entradas de arquivos dos diretórios que passam pelos filtros"""
         for directory in self.directories:
+            self._end_progress_line()
             print(f"Escaneando: {directory}")
             
             if not os.path.exists(directory):
@@ -316,54 +384,70 @@ class CustomFileChecker(FileIntegrityChecker):
                 continue
             
             if self.recursive:
-                # Percorrer recursivamente
-                for root, dirs, files in os.walk(directory):
-                    for file in files:
-                        file_path = os.path.join(root, file)
-                        
-                        if self.should_check_file(file_path):
-                            self.process_file(file_path)
+                # Percorrer recursivamente com o mesmo percurso scandir da base
+                entries = self._iter_file_entries(directory)
             else:
                 # Apenas diretório principal
-                try:
-                    for item in os.listdir(directory):
-                        file_path = os.path.join(directory, item)
-                        
-                        if os.path.isfile(file_path) and self.should_check_file(file_path):
-                            self.process_file(file_path)
-                except PermissionError:
-                    print(f"⚠️  Sem permissão para ler diretório: {directory}")
-        
-        print(f"Verificação concluída. Total: {self.summary['total_files']} arquivos")
+                entries = self._iter_top_level_files(directory)
+            
+            # Filtrar pelo nome já no percurso: arquivos recusados não chegam
+            # a ter stat nem a entrar no pool
+            accepts_name = self._accepts_name
+            for entry in entries:
+                if accepts_name(entry.name):
+                    yield entry
+    
+    def _iter_top_level_files(self, directory):
+        """Listar apenas os arquivos do diretório principal"""
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if entry.is_file():
+                        yield entry
+        except PermissionError:
+            self._end_progress_line()
+            print(f"⚠️  Sem permissão para ler diretório: {directory}")
+    
+    def _end_progress_line(self):
+        """Encerrar a linha de progresso (atualizada com \\r) antes de outra mensagem"""
+        if self._progress_shown:
+            sys.stdout.write("\n")
+            self._progress_shown = False
     
     def process_file(self, file_path):
         """Processar um arquivo individual"""
         try:
-            result = self.check_file_integrity(file_path)
-            self.results.append(result)
-            
-            # Atualizar sumário
-            self.summary['total_files'] += 1
-            
-            if result['integrity_status'] == 'INTACT':
-                self.summary['intact_files'] += 1
-            elif result['integrity_status'] == 'CORRUPTED':
-                self.summary['corrupted_files'] += 1
-            elif result['integrity_status'] == 'INACCESSIBLE':
-                self.summary['inaccessible_files'] += 1
-                
-            # Mostrar progresso a cada 100 arquivos
-            if self.summary['total_files'] % 100 == 0:
-                print(f"  Processados: {self.summary['total_files']} arquivos...")
-                
+            self._record_result(self.check_file_integrity(file_path))
         except Exception as e:
             print(f"❌ Erro ao processar {file_path}: {e}")
     
+    def _report_progress(self):
+        """Atualizar a linha de progresso no máximo uma vez por segundo
+        
+        Substitui o log periódico da classe base, que quebraria a linha.
+        """
+        now = time.monotonic()
+        if now - self._last_progress >= PROGRESS_INTERVAL:
+            self._last_progress = now
+            self._progress_shown = True
+            sys.stdout.write(f"\r  Processados: {self.summary['total_files']} arquivos...")
+            sys.stdout.flush()
+    
     def generate_text_report(self, output_name):
         """Gerar relatório completo em formato texto"""
         report_file = f"{output_name}.txt"
         
-        with open(report_file, 'w', encoding='utf-8') as f:
+        # Uma única passada separa os resultados das seções de problemas
+        corrupted_files = []
+        inaccessible_files = []
+        sections = {'CORRUPTED': corrupted_files, 'INACCESSIBLE': inaccessible_files}
+        for result in self.results:
+            section = sections.get(result.integrity_status)
+            if section is not None:
+                section.append(result)
+        
+        # Buffer grande: o relatório tem uma linha por arquivo verificado
+        with open(report_file, 'w', encoding='utf-8', buffering=1 << 20) as f:
             # Cabeçalho
             f.write("=" * 80 + "\n")
             f.write("                RELATÓRIO DE INTEGRIDADE DE ARQUIVOS\n")
@@ -387,43 +471,38 @@ class CustomFileChecker(FileIntegrityChecker):
             f.write(f"Arquivos corrompidos: {self.summary['corrupted_files']:,}\n")
             f.write(f"Arquivos inacessíveis: {self.summary['inaccessible_files']:,}\n")
             
-            if self.summary['total_files'] > 0:
-                intact_pct = (self.summary['intact_files'] / self.summary['total_files']) * 100
-                corrupted_pct = (self.summary['corrupted_files'] / self.summary['total_files']) * 100
-                inaccessible_pct = (self.summary['inaccessible_files'] / self.summary['total_files']) * 100
-                
+            percentages = compute_summary_percentages(self.summary)
+            if percentages is not None:
                 f.write(f"\nPERCENTUAIS:\n")
-                f.write(f"Taxa de integridade: {intact_pct:.1f}%\n")
-                f.write(f"Taxa de corrupção: {corrupted_pct:.1f}%\n")
-                f.write(f"Taxa de inacessibilidade: {inaccessible_pct:.1f}%\n")
+                f.write(f"Taxa de integridade: {percentages.intact:.1f}%\n")
+                f.write(f"Taxa de corrupção: {percentages.corrupted:.1f}%\n")
+                f.write(f"Taxa de inacessibilidade: {percentages.inaccessible:.1f}%\n")
             
             f.write("\n" + "=" * 80 + "\n\n")
             
             # Arquivos corrompidos
-            corrupted_files = [r for r in self.results if r['integrity_status'] == 'CORRUPTED']
             if corrupted_files:
                 f.write("ARQUIVOS CORROMPIDOS\n")
                 f.write("-" * 20 + "\n")
                 for i, result in enumerate(corrupted_files, 1):
-                    f.write(f"{i:3d}. {result['file_path']}\n")
-                    f.write(f"     Tamanho: {result['file_size']:,} bytes\n")
-                    f.write(f"     Modificado: {result.get('last_modified', 'N/A')}\n")
-                    if result.get('error'):
-                        f.write(f"     Erro: {result['error']}\n")
-                    if 'specific_checks' in result and 'error' in result['specific_checks']:
-                        f.write(f"     Detalhes: {result['specific_checks']['error']}\n")
+                    f.write(f"{i:3d}. {result.file_path}\n")
+                    f.write(f"     Tamanho: {result.file_size:,} bytes\n")
+                    f.write(f"     Modificado: {result.last_modified or 'N/A'}\n")
+                    if result.error:
+                        f.write(f"     Erro: {result.error}\n")
+                    if result.specific_checks and 'error' in result.specific_checks:
+                        f.write(f"     Detalhes: {result.specific_checks['error']}\n")
                     f.write("\n")
                 f.write("\n")
             
             # Arquivos inacessíveis
-            inaccessible_files = [r for r in self.results if r['integrity_status'] == 'INACCESSIBLE']
             if inaccessible_files:
                 f.write("ARQUIVOS INACESSÍVEIS\n")
                 f.write("-" * 21 + "\n")
                 for i, result in enumerate(inaccessible_files, 1):
-                    f.write(f"{i:3d}. {result['file_path']}\n")
-                    if result.get('error'):
-                        f.write(f"     Erro: {result['error']}\n")
+                    f.write(f"{i:3d}. {result.file_path}\n")
+                    if result.error:
+                        f.write(f"     Erro: {result.error}\n")
                     f.write("\n")
                 f.write("\n")
             
@@ -433,20 +512,13 @@ class CustomFileChecker(FileIntegrityChecker):
             f.write("Status | Tamanho    | Arquivo\n")
             f.write("-" * 60 + "\n")
             
-            status_symbols = {
-                'INTACT': '  ✅   ',
-                'CORRUPTED': '  ❌   ',
-                'INACCESSIBLE': '  🚫   ',
-                'UNKNOWN': '  ❓   '
-            }
-            
-            for result in sorted(self.results, key=lambda x: x['file_path']):
-                status = result['integrity_status']
-                symbol = status_symbols.get(status, '  ?   ')
-                size = f"{result['file_size']:>10,}"
-                file_path = result['file_path']
-                
-                f.write(f"{symbol} | {size} | {file_path}\n")
+            # Consultas e formato resolvidos uma vez, fora do laço por arquivo
+            symbol_for = self._STATUS_SYMBOLS.get
+            row = "{} | {:>10,} | {}\n".format
+            f.writelines(
+                row(symbol_for(result.integrity_status, '  ?   '), result.file_size, result.file_path)
+                for result in sorted(self.results, key=attrgetter('file_path'))
+            )
             
             f.write("\n" + "=" * 80 + "\n")
             f.write("Relatório gerado pelo Verificador de Integridade de Arquivos\n")